@@ -1,8 +1,18 @@
+from __future__ import annotations
+
 import asyncio
 
+import click
 import pytest
 
-from universal_silabs_flasher.common import StateMachine, Version, put_first
+from universal_silabs_flasher.common import (
+    CommaSeparatedNumbers,
+    StateMachine,
+    Version,
+    _set_low_latency_mode,
+    crc16_ccitt,
+    put_first,
+)
 
 
 async def test_state_machine_bad_initial_state():
@@ -29,12 +39,41 @@ async def test_state_machine():
     assert sm.state == "a"
 
 
+async def test_state_machine_transient_state():
+    sm = StateMachine(states={"a", "b", "c"}, initial="a")
+
+    waiter = asyncio.create_task(sm.wait_for_state("b"))
+    await asyncio.sleep(0)
+
+    # The waiter is woken up even if the state changes again before it runs
+    sm.state = "b"
+    sm.state = "c"
+
+    await asyncio.wait_for(waiter, timeout=1)
+    assert sm.state == "c"
+
+
+@pytest.mark.parametrize(
+    "data, crc",
+    [
+        (b"", 0x0000),
+        (b"123456789", 0x31C3),
+        (b"\x14\x00\x0a\x00\xc4", 0xD355),
+    ],
+)
+def test_crc16_ccitt(data, crc):
+    assert crc16_ccitt(data) == crc
+
+
 def test_put_first():
     assert put_first([1, 2, 3], [2]) == [2, 1, 3]
     assert put_first([1, 2, 3], [4]) == [4, 1, 2, 3]
     assert put_first([1, 2, 3], [1]) == [1, 2, 3]
     assert put_first([1, 2, 3], [3]) == [3, 1, 2]
 
+    # Duplicates of the moved elements are dropped
+    assert put_first([1, 2, 1], [1]) == [1, 2]
+
 
 @pytest.mark.parametrize(
     "version",
@@ -82,3 +121,63 @@ def test_version_comparison_ezsp():
     assert not Version("7.2.2.0 build 191").compatible_with(
         Version("7.2.2.0 build 190")
     )
+
+
+def test_comma_separated_numbers():
+    assert CommaSeparatedNumbers().convert("115200", None, None) == [115200]
+    assert CommaSeparatedNumbers().convert("1, 2,,3,", None, None) == [1, 2, 3]
+    assert CommaSeparatedNumbers().convert([1, 2], None, None) == [1, 2]
+
+    with pytest.raises(click.BadParameter) as exc_info:
+        CommaSeparatedNumbers().convert("1,foo,3", None, None)
+
+    assert "'foo'" in exc_info.value.message
+
+
+class FakeSerial:
+    def __init__(self, exc: Exception | None = None) -> None:
+        self.exc = exc
+        self.calls: list[bool] = []
+
+    def set_low_latency_mode(self, enabled: bool) -> None:
+        self.calls.append(enabled)
+
+        if self.exc is not None:
+            raise self.exc
+
+
+class FakeSerialTransport(asyncio.Transport):
+    def __init__(self, serial: object) -> None:
+        super().__init__()
+        self.serial = serial
+
+
+def test_set_low_latency_mode():
+    serial = FakeSerial()
+
+    assert _set_low_latency_mode(FakeSerialTransport(serial), True)
+    assert _set_low_latency_mode(FakeSerialTransport(serial), False)
+    assert serial.calls == [True, False]
+
+
+def test_set_low_latency_mode_unsupported_transport():
+    # Sockets and other non-pyserial transports have no such method
+    assert not _set_low_latency_mode(FakeSerialTransport(object()), True)
+    assert not _set_low_latency_mode(asyncio.Transport(), True)
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        # pyserial on macOS and BSD
+        NotImplementedError(),
+        # pyserial on Linux, when the driver rejects the ioctl
+        ValueError("Failed to update ASYNC_LOW_LATENCY flag to True"),
+        OSError(25, "Inappropriate ioctl for device"),
+    ],
+)
+def test_set_low_latency_mode_failure(exc):
+    serial = FakeSerial(exc)
+
+    assert not _set_low_latency_mode(FakeSerialTransport(serial), True)
+    assert serial.calls == [True]
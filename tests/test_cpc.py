@@ -0,0 +1,87 @@
+import pytest
+import zigpy.types as zigpy_t
+
+from universal_silabs_flasher.common import BufferTooShort, crc16_ccitt
+import universal_silabs_flasher.cpc as cpc
+import universal_silabs_flasher.cpc_types as cpc_types
+
+CPC_VERSION_FRAME = bytes.fromhex(
+    "14001600c457e5060110000300000004000000030000000100000012ca"
+)
+
+
+def test_cpc_frame_parsing():
+    frame = cpc.CPCTransportFrame(
+        endpoint=cpc_types.EndpointId.SYSTEM,
+        control=zigpy_t.uint8_t(0xC4),
+        payload=cpc.UnnumberedFrame(
+            command_id=cpc_types.UnnumberedFrameCommandId.PROP_VALUE_IS,
+            command_seq=zigpy_t.uint8_t(1),
+            payload=cpc.PropertyCommand(
+                property_id=cpc_types.PropertyId.SECONDARY_CPC_VERSION,
+                value=bytes.fromhex("040000000300000001000000"),
+            ),
+        ),
+    )
+
+    assert frame.serialize() == CPC_VERSION_FRAME
+    assert cpc.CPCTransportFrame.deserialize(CPC_VERSION_FRAME + b"rest") == (
+        frame,
+        b"rest",
+    )
+
+
+def test_cpc_frame_too_short():
+    with pytest.raises(BufferTooShort):
+        cpc.CPCTransportFrame.deserialize(CPC_VERSION_FRAME[:4])
+
+    with pytest.raises(BufferTooShort):
+        cpc.CPCTransportFrame.deserialize(CPC_VERSION_FRAME[:-1])
+
+
+def test_cpc_frame_invalid_payload_checksum():
+    with pytest.raises(ValueError):
+        cpc.CPCTransportFrame.deserialize(CPC_VERSION_FRAME[:-1] + b"\x00")
+
+
+def test_cpc_protocol_resync():
+    protocol = cpc.CPCProtocol()
+    frames = []
+    protocol.frame_received = frames.append
+
+    corrupted = CPC_VERSION_FRAME[:-1] + b"\x00"
+    protocol.data_received(b"garbage" + corrupted + CPC_VERSION_FRAME)
+
+    assert frames == [cpc.CPCTransportFrame.deserialize(CPC_VERSION_FRAME)[0]]
+    assert not protocol._buffer
+
+
+def test_cpc_protocol_corrupted_payload_skipped():
+    protocol = cpc.CPCProtocol()
+    frames = []
+    protocol.frame_received = frames.append
+
+    # A frame with a valid header whose payload contains a complete frame
+    header = bytes([cpc_types.FLAG, 0x00, len(CPC_VERSION_FRAME) + 2, 0x00, 0xC4])
+    header += crc16_ccitt(header).to_bytes(2, "little")
+    corrupted = header + CPC_VERSION_FRAME + b"\x00\x00"
+
+    protocol.data_received(corrupted + CPC_VERSION_FRAME)
+
+    # The embedded frame is not parsed, only the one following the corrupted frame
+    assert frames == [cpc.CPCTransportFrame.deserialize(CPC_VERSION_FRAME)[0]]
+    assert not protocol._buffer
+
+
+def test_cpc_protocol_multiple_frames():
+    protocol = cpc.CPCProtocol()
+    frames = []
+    protocol.frame_received = frames.append
+
+    protocol.data_received(CPC_VERSION_FRAME * 3 + CPC_VERSION_FRAME[:10])
+    assert len(frames) == 3
+    assert protocol._buffer == CPC_VERSION_FRAME[:10]
+
+    protocol.data_received(CPC_VERSION_FRAME[10:])
+    assert len(frames) == 4
+    assert not protocol._buffer
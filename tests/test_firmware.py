@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import pathlib
 
 import pytest
@@ -8,38 +10,69 @@ from universal_silabs_flasher.common import Version
 FIRMWARES_DIR = pathlib.Path(__file__).parent / "firmwares"
 
 
-def test_firmware_ebl_valid():
-    data = (FIRMWARES_DIR / "ncp-uart-sw-6.4.1.ebl").read_bytes()
-    fw = firmware.parse_firmware_image(data)
+@pytest.fixture(scope="session")
+def firmwares() -> dict[str, tuple[bytes, firmware.FirmwareImage]]:
+    """Read and parse every test firmware image once per session."""
+    images = {}
 
-    assert isinstance(fw, firmware.EBLImage)
-    assert fw.serialize() == data
+    for path in FIRMWARES_DIR.iterdir():
+        data = path.read_bytes()
+        images[path.name] = (data, firmware.parse_firmware_image(data))
 
-    with pytest.raises(KeyError):
-        fw.get_nabucasa_metadata()
+    return images
 
 
-def test_firmware_gbl_valid_no_metadata():
-    data = (
-        FIRMWARES_DIR / "NabuCasa_EZSP_v6.10.3.0_PB32_ncp-uart-hw_115200.gbl"
-    ).read_bytes()
-    fw = firmware.parse_firmware_image(data)
+@pytest.mark.parametrize(
+    "name, fw_cls",
+    [
+        ("ncp-uart-sw-6.4.1.ebl", firmware.EBLImage),
+        ("NabuCasa_EZSP_v6.10.3.0_PB32_ncp-uart-hw_115200.gbl", firmware.GBLImage),
+        (
+            "NabuCasa_SkyConnect_RCP_v4.1.3_rcp-uart-hw-802154_115200.gbl",
+            firmware.GBLImage,
+        ),
+        ("skyconnect_zigbee_ncp_7.4.4.0.gbl", firmware.GBLImage),
+    ],
+)
+def test_firmware_valid(firmwares, name, fw_cls):
+    data, fw = firmwares[name]
 
-    assert isinstance(fw, firmware.GBLImage)
+    assert isinstance(fw, fw_cls)
     assert fw.serialize() == data
 
+
+def test_firmware_ebl_tag_serialization(firmwares):
+    data, fw = firmwares["ncp-uart-sw-6.4.1.ebl"]
+
+    # Tag IDs serialize in the same byte order as they appear in the image
+    tag_id, value = fw.tags[-1]
+    assert tag_id == firmware.EBLTagId.END
+    assert data.rfind(tag_id.serialize() + len(value).to_bytes(2, "big")) != -1
+
+
+@pytest.mark.parametrize("data", [b"\x01\x02\x03\x04" * 16, b"", b"\x00"])
+def test_firmware_unknown_type(data):
+    with pytest.raises(ValueError, match="Unknown firmware image type"):
+        firmware.parse_firmware_image(data)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "ncp-uart-sw-6.4.1.ebl",
+        "NabuCasa_EZSP_v6.10.3.0_PB32_ncp-uart-hw_115200.gbl",
+    ],
+)
+def test_firmware_no_metadata(firmwares, name):
+    _, fw = firmwares[name]
+
     with pytest.raises(KeyError):
         fw.get_nabucasa_metadata()
 
 
-def test_firmware_gbl_valid_with_metadata():
-    data = (
-        FIRMWARES_DIR / "NabuCasa_SkyConnect_RCP_v4.1.3_rcp-uart-hw-802154_115200.gbl"
-    ).read_bytes()
-    fw = firmware.parse_firmware_image(data)
+def test_firmware_gbl_valid_with_metadata(firmwares):
+    _, fw = firmwares["NabuCasa_SkyConnect_RCP_v4.1.3_rcp-uart-hw-802154_115200.gbl"]
 
-    assert isinstance(fw, firmware.GBLImage)
-    assert fw.serialize() == data
     assert fw.get_nabucasa_metadata() == firmware.NabuCasaMetadata(
         metadata_version=1,
         sdk_version=Version("4.1.3"),
@@ -57,12 +90,9 @@ def test_firmware_gbl_valid_with_metadata():
     )
 
 
-def test_firmware_gbl_valid_with_metadata_v2():
-    data = (FIRMWARES_DIR / "skyconnect_zigbee_ncp_7.4.4.0.gbl").read_bytes()
-    fw = firmware.parse_firmware_image(data)
+def test_firmware_gbl_valid_with_metadata_v2(firmwares):
+    _, fw = firmwares["skyconnect_zigbee_ncp_7.4.4.0.gbl"]
 
-    assert isinstance(fw, firmware.GBLImage)
-    assert fw.serialize() == data
     assert fw.get_nabucasa_metadata() == firmware.NabuCasaMetadata(
         metadata_version=2,
         sdk_version=Version("4.4.4"),
@@ -3,6 +3,15 @@ import pytest
 from universal_silabs_flasher.common import crc16_kermit
 import universal_silabs_flasher.spinel as spinel
 
+NCP_VERSION_FRAME = bytes.fromhex(
+    "8106024f50454e5448524541442f366666316163302d64697274793b2045465233323b"
+    "2044656320323320323032322031383a30383a303000"
+)
+NCP_VERSION_FRAME_HDLC = bytes.fromhex(
+    "7e8106024f50454e5448524541442f366666316163302d64697274793b204546523332"
+    "3b2044656320323320323032322031383a30383a303000fa8c7e"
+)
+
 
 @pytest.mark.parametrize(
     "data, crc",
@@ -23,16 +32,7 @@ def test_hdlc_lite_crc(data, crc):
         (bytes.fromhex("7e8103367d5e7d5d6af97e"), bytes.fromhex("8103367e7d")),
         (bytes.fromhex("7e810365010b287e"), bytes.fromhex("81036501")),
         (bytes.fromhex("7e8103862a01547d5e7e"), bytes.fromhex("8103862a01")),
-        (
-            bytes.fromhex(
-                "7e8106024f50454e5448524541442f366666316163302d64697274793b204546523332"
-                "3b2044656320323320323032322031383a30383a303000fa8c7e"
-            ),
-            bytes.fromhex(
-                "8106024f50454e5448524541442f366666316163302d64697274793b2045465233323b"
-                "2044656320323320323032322031383a30383a303000"
-            ),
-        ),
+        (NCP_VERSION_FRAME_HDLC, NCP_VERSION_FRAME),
     ],
 )
 def test_hdlc_lite_encoding_decoding(encoded, decoded):
@@ -40,14 +40,16 @@ def test_hdlc_lite_encoding_decoding(encoded, decoded):
     assert spinel.HDLCLiteFrame.from_bytes(encoded).data == decoded
 
 
+def test_hdlc_lite_invalid_escape():
+    with pytest.raises(ValueError):
+        spinel.HDLCLiteFrame.from_bytes(bytes.fromhex("7e81037d0102037e"))
+
+
 @pytest.mark.parametrize(
     "encoded, decoded",
     [
         (
-            bytes.fromhex(
-                "8106024f50454e5448524541442f366666316163302d64697274793b2045465233323b"
-                "2044656320323320323032322031383a30383a303000"
-            ),
+            NCP_VERSION_FRAME,
             spinel.SpinelFrame(
                 header=spinel.SpinelHeader(
                     transaction_id=1,
@@ -63,3 +65,19 @@ def test_hdlc_lite_encoding_decoding(encoded, decoded):
 def test_spinel_parsing(encoded, decoded):
     assert spinel.SpinelFrame.from_bytes(encoded) == decoded
     assert decoded.serialize() == encoded
+
+
+async def test_spinel_protocol_partial_frames():
+    protocol = spinel.SpinelProtocol()
+    frames = []
+    protocol.frame_received = frames.append
+
+    # The second frame is split across two reads
+    protocol.data_received(NCP_VERSION_FRAME_HDLC + NCP_VERSION_FRAME_HDLC[:10])
+    assert len(frames) == 1
+
+    protocol.data_received(NCP_VERSION_FRAME_HDLC[10:])
+    assert len(frames) == 2
+
+    assert frames[0] == frames[1] == spinel.SpinelFrame.from_bytes(NCP_VERSION_FRAME)
+    assert not protocol._buffer
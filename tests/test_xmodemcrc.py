@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import universal_silabs_flasher.xmodemcrc as xmodemcrc
+
+
+class AckingTransport(asyncio.Transport):
+    """Transport that acknowledges every XModem packet written to it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[bytes] = []
+        self._protocol: asyncio.Protocol = asyncio.Protocol()
+
+    def get_protocol(self) -> asyncio.Protocol:
+        return self._protocol
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        assert isinstance(protocol, asyncio.Protocol)
+        self._protocol = protocol
+
+    def is_closing(self) -> bool:
+        return False
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self.writes.append(bytes(data))
+        asyncio.get_running_loop().call_soon(
+            self._protocol.data_received, bytes([xmodemcrc.PacketType.ACK])
+        )
+
+
+async def test_send_xmodem128_crc_padding():
+    transport = AckingTransport()
+    data = bytes(range(200))
+    progress: list[tuple[int, int]] = []
+
+    # The receiver starts the transfer once the protocol has been swapped
+    asyncio.get_running_loop().call_soon(
+        lambda: transport.get_protocol().data_received(b"C")
+    )
+    await xmodemcrc.send_xmodem128_crc(
+        data,
+        transport=transport,
+        progress_callback=lambda current, total: progress.append((current, total)),
+        padding=b"\xff",
+    )
+
+    assert transport.writes == [
+        xmodemcrc.XmodemCRCPacket(number=1, payload=data[:128]).serialize(),
+        xmodemcrc.XmodemCRCPacket(
+            number=2, payload=data[128:] + b"\xff" * 56
+        ).serialize(),
+        bytes([xmodemcrc.PacketType.EOT]),
+    ]
+    assert progress == [(0, 200), (128, 200), (200, 200)]
+
+
+async def test_send_xmodem128_crc_unpadded():
+    with pytest.raises(ValueError):
+        await xmodemcrc.send_xmodem128_crc(b"\x00" * 200, transport=AckingTransport())
@@ -1,20 +1,23 @@
 from __future__ import annotations
 
 import asyncio
-import collections
+import binascii
 import contextlib
-import dataclasses
 import functools
 import logging
 import re
+import sys
 import typing
 
-import async_timeout
 import click
-import crc
 import serial_asyncio
 import zigpy.serial
 
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as asyncio_timeout
+else:
+    from async_timeout import timeout as asyncio_timeout
+
 if typing.TYPE_CHECKING:
     from typing_extensions import Self
 
@@ -24,49 +27,23 @@ CONNECT_TIMEOUT = 1
 PROBE_TIMEOUT = 2
 
 
-CRC_CCITT = crc.Calculator(
-    crc.Configuration(
-        width=16,
-        polynomial=0x1021,
-        init_value=0x0000,
-        final_xor_value=0x0000,
-        reverse_input=False,
-        reverse_output=False,
-    )
-)
-
-CRC_KERMIT = crc.Calculator(
-    crc.Configuration(
-        width=16,
-        polynomial=0x1021,
-        init_value=0xFFFF,
-        final_xor_value=0xFFFF,
-        reverse_input=True,
-        reverse_output=True,
-    )
-)
+# Maps every byte to the same byte with its bits in reverse order
+BIT_REVERSE_TABLE = bytes(int(f"{b:08b}"[::-1], 2) for b in range(256))
 
 
 # Used by both CPC and XModem
 def crc16_ccitt(data: bytes) -> int:
-    return CRC_CCITT.checksum(data)
+    return binascii.crc_hqx(data, 0x0000)
 
 
 # Used by HDLC-Lite
 def crc16_kermit(data: bytes) -> int:
-    return CRC_KERMIT.checksum(data)
-
-
-def pad_to_multiple(data: bytes, multiple: int, padding: bytes) -> bytes:
-    assert len(padding) == 1
-
-    if len(data) % multiple == 0:
-        return data
-
-    num_complete_blocks = len(data) // multiple
-    padded_size = multiple * (num_complete_blocks + 1)
+    # CRC-16/Kermit (X.25) is the bit-reflected form of the CCITT CRC, which lets us
+    # compute it with the C implementation of `crc_hqx`
+    crc = binascii.crc_hqx(data.translate(BIT_REVERSE_TABLE), 0xFFFF)
+    reflected = (BIT_REVERSE_TABLE[crc & 0xFF] << 8) | BIT_REVERSE_TABLE[crc >> 8]
 
-    return data + padding * (padded_size - len(data))
+    return reflected ^ 0xFFFF
 
 
 class BufferTooShort(Exception):
@@ -83,9 +60,10 @@ class StateMachine:
         self._states = states
         self._state = initial
 
-        self._futures_for_state: collections.defaultdict[str, list[asyncio.Future]] = (
-            collections.defaultdict(list)
-        )
+        self._events_for_state: dict[str, asyncio.Event] = {
+            state: asyncio.Event() for state in states
+        }
+        self._events_for_state[initial].set()
 
     @property
     def state(self) -> str:
@@ -96,10 +74,10 @@ class StateMachine:
         if state not in self._states:
             raise ValueError(f"Unknown state {state!r}: expected {self._states!r}")
 
+        # Waiters that have already been woken up are unaffected by clearing
+        self._events_for_state[self._state].clear()
         self._state = state
-
-        for future in self._futures_for_state[state]:
-            future.set_result(None)
+        self._events_for_state[state].set()
 
     async def wait_for_state(self, state: str) -> None:
         """Waits for a state. Returns immediately if the state is active."""
@@ -108,14 +86,7 @@ class StateMachine:
         if self.state == state:
             return
 
-        future = asyncio.get_running_loop().create_future()
-        self._futures_for_state[state].append(future)
-
-        try:
-            return await future
-        finally:
-            # Always clean up the future
-            self._futures_for_state[state].remove(future)
+        await self._events_for_state[state].wait()
 
 
 class SerialProtocol(asyncio.Protocol):
@@ -139,12 +110,21 @@ class SerialProtocol(asyncio.Protocol):
     def send_data(self, data: bytes) -> None:
         """Sends data over the connected transport."""
         assert self._transport is not None
-        data = bytes(data)
-        _LOGGER.debug("Sending data %s", data)
+
+        # Mutable buffers and `bytes` subclasses like enum members are copied into
+        # plain `bytes`, since the transport may hold on to them
+        if type(data) is not bytes:
+            data = bytes(data)
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Sending data %s", data)
+
         self._transport.write(data)
 
     def data_received(self, data: bytes) -> None:
-        _LOGGER.debug("Received data %s", data)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Received data %s", data)
+
         self._buffer += data
 
     def disconnect(self) -> None:
@@ -173,22 +153,44 @@ def patch_pyserial_asyncio() -> None:
     serial_asyncio.SerialTransport.set_protocol = set_protocol
 
 
+def _set_low_latency_mode(transport: asyncio.Transport, enabled: bool) -> bool:
+    """Toggle the serial driver's read coalescing, returning whether it succeeded."""
+    serial = getattr(transport, "serial", None)
+
+    # pyserial's POSIX ports all have this method but only Linux implements it
+    if not hasattr(serial, "set_low_latency_mode"):
+        return False
+
+    try:
+        serial.set_low_latency_mode(enabled)
+    except (NotImplementedError, ValueError, OSError) as e:
+        _LOGGER.debug("Failed to set low latency mode to %s: %r", enabled, e)
+        return False
+
+    return True
+
+
 @contextlib.asynccontextmanager
 async def connect_protocol(port, baudrate, factory):
     loop = asyncio.get_running_loop()
 
-    async with async_timeout.timeout(CONNECT_TIMEOUT):
-        _, protocol = await zigpy.serial.create_serial_connection(
+    async with asyncio_timeout(CONNECT_TIMEOUT):
+        transport, protocol = await zigpy.serial.create_serial_connection(
             loop=loop,
             protocol_factory=factory,
             url=port,
             baudrate=baudrate,
         )
+        low_latency = _set_low_latency_mode(transport, True)
         await protocol.wait_until_connected()
 
     try:
         yield protocol
     finally:
+        # The flag is a property of the tty and outlives our file descriptor
+        if low_latency and not transport.is_closing():
+            _set_low_latency_mode(transport, False)
+
         protocol.disconnect()
 
         # Required for Windows to be able to re-connect to the same serial port
@@ -224,21 +226,19 @@ class CommaSeparatedNumbers(click.ParamType):
 
 def put_first(lst: list[typing.Any], elements: list[typing.Any]) -> list[typing.Any]:
     """Orders a list so that the provided element is first."""
-    return elements + [e for e in lst if e not in elements]
+    excluded = set(elements)
+    return elements + [e for e in lst if e not in excluded]
 
 
-@dataclasses.dataclass(frozen=True, order=True)
-class VersionComponent:
+class VersionComponent(typing.NamedTuple):
     comparable: bool
     data: str | int
 
 
 @functools.total_ordering
 class Version:
-    _SEPARATORS = {".", "-", "/", "_", " build "}
-    _SEPARATORS_REGEX = re.compile(
-        "(" + "|".join(re.escape(s) for s in _SEPARATORS) + ")"
-    )
+    # Single character separators are matched with a character class
+    _SEPARATORS_REGEX = re.compile(r"( build |[./_-])")
 
     def __init__(self, version: str) -> None:
         self.components: list[VersionComponent] = []
@@ -257,8 +257,10 @@ class Version:
                     VersionComponent(comparable=False, data=component)
                 )
 
+        self._comparable_components = tuple(c for c in self.components if c.comparable)
+
     def comparable_components(self) -> tuple[VersionComponent, ...]:
-        return tuple(c for c in self.components if c.comparable)
+        return self._comparable_components
 
     def compatible_with(self, other: Self) -> bool:
         our_comparable = self.comparable_components()
@@ -20,6 +20,12 @@ LEGACY_FIRMWARE_TYPE_REMAPPING = {
     "gecko-bootloader": FirmwareImageType.BOOTLOADER,
 }
 
+# Resolves both current and legacy firmware type strings with a single lookup
+FIRMWARE_TYPE_STRINGS = {
+    **{fw_type.value: fw_type for fw_type in FirmwareImageType},
+    **LEGACY_FIRMWARE_TYPE_REMAPPING,
+}
+
 
 class ApplicationType(enum.Enum):
     GECKO_BOOTLOADER = "bootloader"
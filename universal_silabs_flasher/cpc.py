@@ -3,35 +3,71 @@ from __future__ import annotations
 import asyncio
 import dataclasses
 import logging
-import typing
+import struct
 
-import async_timeout
 import zigpy.types
 
 from . import cpc_types
-from .common import BufferTooShort, SerialProtocol, Version, crc16_ccitt
+from .common import (
+    BufferTooShort,
+    SerialProtocol,
+    Version,
+    asyncio_timeout,
+    crc16_ccitt,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+_FLAG_BYTES = bytes([cpc_types.FLAG])
 
-def parse_subframe(cpc_frame: CPCTransportFrame) -> UnnumberedFrame:
+# Flag, endpoint, length, control
+_HEADER_STRUCT = struct.Struct("<BBHB")
+_CHECKSUM_STRUCT = struct.Struct("<H")
+
+# Command ID, command sequence, payload length
+_UNNUMBERED_HEADER_STRUCT = struct.Struct("<BBH")
+
+
+class InvalidFramePayload(ValueError):
+    """Frame has a valid header but its payload could not be parsed."""
+
+    def __init__(self, message: str, frame_end: int) -> None:
+        super().__init__(message)
+        self.frame_end = frame_end
+
+
+def frame_type_from_control(control: int) -> cpc_types.FrameType:
+    """Extracts the frame type from a CPC frame control byte."""
+    frame_type = (control & 0b11000000) >> 6
+
+    if frame_type == 0:
+        frame_type = 1
+
+    return cpc_types.FrameType(frame_type)
+
+
+def parse_subframe(control: int, payload: bytes) -> UnnumberedFrame:
     """Parses a CPC sub-frame from a CPC frame. Only `UnnumberedFrame` is supported."""
-    frame_type = cpc_frame.frame_type()
+    frame_type = frame_type_from_control(control)
 
     if frame_type != cpc_types.FrameType.UNNUMBERED:
         raise ValueError(f"Unsupported frame type: {frame_type!r}")
 
-    return UnnumberedFrame.from_bytes(cpc_frame.payload)
+    return UnnumberedFrame.from_bytes(payload)
 
 
 class Command:
     """Base class for unnumbered commands."""
 
+    __slots__ = ()
+
 
 @dataclasses.dataclass(frozen=True)
 class PropertyCommand(Command):
     """Unnumbered frame command to get/set/read a property."""
 
+    __slots__ = ("property_id", "value")
+
     property_id: cpc_types.PropertyId
     value: bytes
 
@@ -52,6 +88,8 @@ class PropertyCommand(Command):
 class ResetCommand(Command):
     """Unnumbered frame command to reset the device."""
 
+    __slots__ = ("status",)
+
     # The `status` field is set when the device responds
     status: cpc_types.Status | None
 
@@ -73,6 +111,8 @@ class ResetCommand(Command):
 class UnnumberedFrame:
     """Unnumbered CPC frame"""
 
+    __slots__ = ("command_id", "command_seq", "payload")
+
     command_id: cpc_types.UnnumberedFrameCommandId
     command_seq: zigpy.types.uint8_t
     payload: bytes
@@ -86,31 +126,37 @@ class UnnumberedFrame:
 
     @classmethod
     def from_bytes(cls, data: bytes) -> UnnumberedFrame:
-        command_id, data = cpc_types.UnnumberedFrameCommandId.deserialize(data)
-        command_seq, data = zigpy.types.uint8_t.deserialize(data)
-        length, data = zigpy.types.uint16_t.deserialize(data)
-
-        if len(data) < length:
+        if len(data) < _UNNUMBERED_HEADER_STRUCT.size:
             raise ValueError("Frame is too short")
 
-        payload, data = data[:length], data[length:]
+        command_id, command_seq, length = _UNNUMBERED_HEADER_STRUCT.unpack_from(data)
+        command_id = cpc_types.UnnumberedFrameCommandId(command_id)
+        command_seq = zigpy.types.uint8_t(command_seq)
+        payload = data[_UNNUMBERED_HEADER_STRUCT.size :]
 
-        if data:
+        if len(payload) < length:
+            raise ValueError("Frame is too short")
+        elif len(payload) > length:
             raise ValueError("Trailing data in frame")
 
+        try:
+            command_cls = cls._COMMANDS[command_id]
+        except KeyError:
+            raise ValueError(f"Unsupported command: {command_id!r}")
+
         return cls(
             command_id=command_id,
             command_seq=command_seq,
-            payload=cls._COMMANDS[command_id].from_bytes(payload),
+            payload=command_cls.from_bytes(payload),
         )
 
     def to_bytes(self) -> bytes:
         payload = self.payload.to_bytes()
 
         return (
-            self.command_id.serialize()
-            + self.command_seq.serialize()
-            + zigpy.types.uint16_t(len(payload)).serialize()
+            _UNNUMBERED_HEADER_STRUCT.pack(
+                self.command_id, self.command_seq, len(payload)
+            )
             + payload
         )
 
@@ -119,6 +165,8 @@ class UnnumberedFrame:
 class CPCTransportFrame:
     """CPC transport frame"""
 
+    __slots__ = ("endpoint", "control", "payload")
+
     endpoint: cpc_types.EndpointId
     control: zigpy.types.uint8_t
     payload: bytes
@@ -126,67 +174,82 @@ class CPCTransportFrame:
     def serialize(self) -> bytes:
         """Serialize the transport frame and compute lengths and checksums."""
         payload = self.payload.to_bytes()
-        length = zigpy.types.uint16_t(len(payload) + 2)
+        header = _HEADER_STRUCT.pack(
+            cpc_types.FLAG,
+            self.endpoint,
+            len(payload) + _CHECKSUM_STRUCT.size,
+            self.control,
+        )
 
-        header = (
-            cpc_types.FLAG.serialize()
-            + self.endpoint.serialize()
-            + length.serialize()
-            + self.control.serialize()
+        return b"".join(
+            [
+                header,
+                _CHECKSUM_STRUCT.pack(crc16_ccitt(header)),
+                payload,
+                _CHECKSUM_STRUCT.pack(crc16_ccitt(payload)),
+            ]
         )
 
-        header_checksum = crc16_ccitt(header).to_bytes(2, "little")
-        payload_checksum = crc16_ccitt(payload).to_bytes(2, "little")
+    @classmethod
+    def deserialize(cls, data: bytes) -> tuple[CPCTransportFrame, bytes]:
+        frame, end = cls.deserialize_from(data, 0)
 
-        return header + header_checksum + payload + payload_checksum
+        return frame, data[end:]
 
     @classmethod
-    def deserialize(cls, data: bytes) -> tuple[CPCTransportFrame, bytes]:
-        if len(data) < 7:
+    def deserialize_from(
+        cls, data: bytes, offset: int
+    ) -> tuple[CPCTransportFrame, int]:
+        """Deserialize the frame starting at `offset`, returning the offset after it."""
+        header_end = offset + _HEADER_STRUCT.size
+
+        if len(data) < header_end + _CHECKSUM_STRUCT.size:
             raise BufferTooShort("Data is too short to contain packet header")
 
-        orig_data = data
-        flag, data = zigpy.types.uint8_t.deserialize(data)
+        flag, endpoint, length, control = _HEADER_STRUCT.unpack_from(data, offset)
+        (header_checksum,) = _CHECKSUM_STRUCT.unpack_from(data, header_end)
 
         if flag != cpc_types.FLAG:
             raise ValueError("Invalid flag")
 
-        endpoint, data = cpc_types.EndpointId.deserialize(data)
-        length, data = zigpy.types.uint16_t.deserialize(data)
-        control, data = zigpy.types.uint8_t.deserialize(data)
-        header_checksum, data = zigpy.types.uint16_t.deserialize(data)
+        # Checksums are computed over a view to avoid copying the buffer
+        with memoryview(data) as view:
+            if crc16_ccitt(view[offset:header_end]) != header_checksum:
+                raise ValueError("Invalid header checksum")
 
-        if crc16_ccitt(orig_data[:5]) != header_checksum:
-            raise ValueError("Invalid header checksum")
+            if length < _CHECKSUM_STRUCT.size:
+                raise ValueError("Invalid payload length")
 
-        if len(data) < length:
-            raise BufferTooShort("Data is too short to contain packet payload")
+            payload_start = header_end + _CHECKSUM_STRUCT.size
+            payload_end = payload_start + length - _CHECKSUM_STRUCT.size
 
-        payload, data = data[: length - 2], data[length - 2 :]
-        payload_checksum, data = zigpy.types.uint16_t.deserialize(data)
+            if len(view) < payload_end + _CHECKSUM_STRUCT.size:
+                raise BufferTooShort("Data is too short to contain packet payload")
 
-        if crc16_ccitt(payload) != payload_checksum:
-            raise ValueError("Invalid payload checksum")
+            (payload_checksum,) = _CHECKSUM_STRUCT.unpack_from(view, payload_end)
 
-        frame = cls(
-            endpoint=endpoint,
-            control=control,
-            payload=payload,
-        )
+            frame_end = payload_end + _CHECKSUM_STRUCT.size
 
-        frame_with_parsed_payload = dataclasses.replace(
-            frame, payload=parse_subframe(frame)
-        )
+            if crc16_ccitt(view[payload_start:payload_end]) != payload_checksum:
+                raise InvalidFramePayload("Invalid payload checksum", frame_end)
 
-        return frame_with_parsed_payload, data
+            payload = view[payload_start:payload_end].tobytes()
 
-    def frame_type(self) -> cpc_types.FrameType:
-        frame_type = (self.control & 0b11000000) >> 6
+        try:
+            subframe = parse_subframe(control, payload)
+        except ValueError as e:
+            raise InvalidFramePayload(str(e), frame_end) from e
+
+        frame = cls(
+            endpoint=cpc_types.EndpointId(endpoint),
+            control=zigpy.types.uint8_t(control),
+            payload=subframe,
+        )
 
-        if frame_type == 0:
-            frame_type = 1
+        return frame, frame_end
 
-        return cpc_types.FrameType(frame_type)
+    def frame_type(self) -> cpc_types.FrameType:
+        return frame_type_from_control(self.control)
 
     def seq(self) -> int:
         return (self.control & 0b01110000) >> 4
@@ -282,19 +345,39 @@ class CPCProtocol(SerialProtocol):
     def data_received(self, data: bytes) -> None:
         super().data_received(data)
 
-        while self._buffer:
+        frames = []
+        offset = 0
+
+        # Parse every complete frame first and trim the buffer only once
+        while offset < len(self._buffer):
             try:
-                frame, new_buffer = CPCTransportFrame.deserialize(self._buffer)
-                self._buffer = typing.cast(bytearray, new_buffer)
+                frame, offset = CPCTransportFrame.deserialize_from(self._buffer, offset)
             except BufferTooShort:
                 break
             except ValueError as e:
-                self._buffer = self._buffer[
-                    self._buffer.find(bytes([cpc_types.FLAG])) :
-                ]
-                _LOGGER.debug("Failed to parse buffer %r: %r", self._buffer, e)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug(
+                        "Failed to parse buffer %r: %r",
+                        bytes(self._buffer[offset : offset + 64]),
+                        e,
+                    )
+
+                if isinstance(e, InvalidFramePayload):
+                    # The header checksum vouches for the length, skip the whole frame
+                    offset = e.frame_end
+                else:
+                    # Skip past the current flag and resynchronize on the next one
+                    offset = self._buffer.find(_FLAG_BYTES, offset + 1)
+
+                    if offset == -1:
+                        offset = len(self._buffer)
             else:
-                self.frame_received(frame)
+                frames.append(frame)
+
+        del self._buffer[:offset]
+
+        for frame in frames:
+            self.frame_received(frame)
 
     def frame_received(self, frame: CPCTransportFrame) -> None:
         _LOGGER.debug("Parsed frame %s %s", frame.unnumbered_type(), frame)
@@ -333,16 +416,18 @@ class CPCProtocol(SerialProtocol):
 
         assert self._command_seq not in self._pending_frames
 
+        data = frame.serialize()
+
         future = asyncio.get_running_loop().create_future()
         self._pending_frames[frame.payload.command_seq] = future
 
         try:
             for attempt in range(retries + 1):
                 _LOGGER.debug("Sending frame %s", frame)
-                self.send_data(frame.serialize())
+                self.send_data(data)
 
                 try:
-                    async with async_timeout.timeout(timeout):
+                    async with asyncio_timeout(timeout):
                         return await asyncio.shield(future)
                 except asyncio.TimeoutError:
                     _LOGGER.debug(
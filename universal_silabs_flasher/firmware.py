@@ -3,17 +3,34 @@ from __future__ import annotations
 import dataclasses
 import json
 import logging
+import struct
 import typing
 
-from zigpy.ota.validators import ValidationError, parse_silabs_ebl, parse_silabs_gbl
 import zigpy.types as zigpy_t
 
-from .common import Version, pad_to_multiple
-from .const import LEGACY_FIRMWARE_TYPE_REMAPPING, FirmwareImageType
+from .common import Version
+from .const import FIRMWARE_TYPE_STRINGS, FirmwareImageType
 
 _LOGGER = logging.getLogger(__name__)
 
 NABUCASA_METADATA_VERSION = 2
+NABUCASA_METADATA_KEYS = frozenset(
+    {
+        "metadata_version",
+        "sdk_version",
+        "ezsp_version",
+        "ot_rcp_version",
+        "cpc_version",
+        "fw_type",
+        "fw_variant",
+        "baudrate",
+    }
+)
+
+# Tag ID and length
+_GBL_TAG_HEADER = struct.Struct("<II")
+
+_EBL_TAG_HEADER = struct.Struct(">HH")
 
 
 class GBLTagId(zigpy_t.enum32):
@@ -49,17 +66,23 @@ class GBLTagId(zigpy_t.enum32):
     END = 0xFC0404FC
 
 
-class EBLTagId(zigpy_t.enum16):
-    # TODO: flip the endianness
+_GBL_TAGS_BY_VALUE = {tag.value: tag for tag in GBLTagId}
+
+
+class EBLTagId(zigpy_t.enum16_be):
+    # Unlike GBL tags, EBL tag IDs are stored big-endian
     HEADER = 0x0000
-    PROG = 0x01FE
-    MFGPROG = 0xFE02
-    ERASEPROG = 0x03FD
-    END = 0x04FC
-    ENC_HEADER = 0x05FB
-    ENC_INIT = 0x06FA
-    ENC_EBL_DATA = 0x07F9
-    ENC_MAC = 0x09F7
+    PROG = 0xFE01
+    MFGPROG = 0x02FE
+    ERASEPROG = 0xFD03
+    END = 0xFC04
+    ENC_HEADER = 0xFB05
+    ENC_INIT = 0xFA06
+    ENC_EBL_DATA = 0xF907
+    ENC_MAC = 0xF709
+
+
+_EBL_TAGS_BY_VALUE = {tag.value: tag for tag in EBLTagId}
 
 
 @dataclasses.dataclass(frozen=True)
@@ -87,8 +110,7 @@ class NabuCasaMetadata:
 
     @classmethod
     def from_json(cls, obj: dict[str, typing.Any]) -> NabuCasaMetadata:
-        original_json = json.loads(json.dumps(obj))
-        metadata_version = obj.pop("metadata_version")
+        metadata_version = obj["metadata_version"]
 
         if metadata_version > NABUCASA_METADATA_VERSION:
             raise ValueError(
@@ -96,35 +118,34 @@ class NabuCasaMetadata:
                 f" expected {NABUCASA_METADATA_VERSION}"
             )
 
-        if sdk_version := obj.pop("sdk_version", None):
+        if sdk_version := obj.get("sdk_version"):
             sdk_version = Version(sdk_version)
 
-        if ezsp_version := obj.pop("ezsp_version", None):
+        if ezsp_version := obj.get("ezsp_version"):
             ezsp_version = Version(ezsp_version)
 
-        if ot_rcp_version := obj.pop("ot_rcp_version", None):
+        if ot_rcp_version := obj.get("ot_rcp_version"):
             ot_rcp_version = Version(ot_rcp_version)
 
-        if cpc_version := obj.pop("cpc_version", None):
+        if cpc_version := obj.get("cpc_version"):
             cpc_version = Version(cpc_version)
 
-        if fw_type := obj.pop("fw_type", None):
-            if fw_type in LEGACY_FIRMWARE_TYPE_REMAPPING:
-                fw_type = LEGACY_FIRMWARE_TYPE_REMAPPING[fw_type]
-
-            try:
-                fw_type = FirmwareImageType(fw_type)
-            except ValueError:
-                _LOGGER.warning("Unknown firmware type: %r", fw_type)
-                fw_type = None
+        if fw_type_str := obj.get("fw_type"):
+            fw_type = FIRMWARE_TYPE_STRINGS.get(fw_type_str)
 
-        if fw_variant := obj.pop("fw_variant", None):
-            fw_variant = fw_variant
+            if fw_type is None:
+                _LOGGER.warning("Unknown firmware type: %r", fw_type_str)
+        else:
+            fw_type = None
 
-        baudrate = obj.pop("baudrate", None)
+        fw_variant = obj.get("fw_variant")
+        baudrate = obj.get("baudrate")
 
-        if obj:
-            _LOGGER.warning("Unexpected keys in JSON remain: %r", obj)
+        if unexpected_keys := obj.keys() - NABUCASA_METADATA_KEYS:
+            _LOGGER.warning(
+                "Unexpected keys in JSON remain: %r",
+                {k: v for k, v in obj.items() if k in unexpected_keys},
+            )
 
         return cls(
             metadata_version=metadata_version,
@@ -135,7 +156,7 @@ class NabuCasaMetadata:
             fw_type=fw_type,
             fw_variant=fw_variant,
             baudrate=baudrate,
-            original_json=original_json,
+            original_json=dict(obj),
         )
 
 
@@ -143,6 +164,19 @@ class NabuCasaMetadata:
 class FirmwareImage:
     tags: list[tuple[GBLTagId, bytes]]
 
+    # Index of the first occurrence of every tag, built once at construction time
+    _first_tags: dict[GBLTagId, bytes] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        first_tags: dict[GBLTagId, bytes] = {}
+
+        for tag, value in self.tags:
+            first_tags.setdefault(tag, value)
+
+        object.__setattr__(self, "_first_tags", first_tags)
+
     @classmethod
     def from_bytes(cls, data: bytes) -> FirmwareImage:
         raise NotImplementedError()
@@ -152,8 +186,8 @@ class FirmwareImage:
 
     def get_first_tag(self, tag_id: GBLTagId) -> bytes:
         try:
-            return next(v for t, v in self.tags if t == tag_id)
-        except StopIteration:
+            return self._first_tags[tag_id]
+        except KeyError:
             raise KeyError(f"No tag with id {tag_id!r} exists")
 
 
@@ -161,28 +195,35 @@ class FirmwareImage:
 class GBLImage(FirmwareImage):
     @classmethod
     def from_bytes(cls, data: bytes) -> GBLImage:
-        if isinstance(data, memoryview):
-            data = data.tobytes()
+        from zigpy.ota.validators import parse_silabs_gbl
 
         tags = []
 
-        for tag_bytes, value in parse_silabs_gbl(data):
-            tag, _ = GBLTagId.deserialize(tag_bytes)
-            tags.append((tag, value))
+        # The parser slices off every tag it reads, which is only cheap on a view
+        for tag_bytes, value in parse_silabs_gbl(memoryview(data)):
+            tag_id = int.from_bytes(tag_bytes, "little")
+            tag = _GBL_TAGS_BY_VALUE.get(tag_id)
+
+            if tag is None:
+                tag = GBLTagId(tag_id)
+
+            tags.append((tag, value.tobytes()))
 
         return cls(tags=tags)
 
     def serialize(self) -> bytes:
-        return pad_to_multiple(
-            b"".join(
-                [
-                    tag_id.serialize() + len(value).to_bytes(4, "little") + value
-                    for tag_id, value in self.tags
-                ]
-            ),
-            4,
-            b"\xff",
-        )
+        size = sum(_GBL_TAG_HEADER.size + len(value) for _, value in self.tags)
+        data = bytearray(b"\xff") * (size + -size % 4)
+        offset = 0
+
+        for tag_id, value in self.tags:
+            _GBL_TAG_HEADER.pack_into(data, offset, tag_id, len(value))
+            offset += _GBL_TAG_HEADER.size
+
+            data[offset : offset + len(value)] = value
+            offset += len(value)
+
+        return bytes(data)
 
     def get_nabucasa_metadata(self) -> NabuCasaMetadata:
         metadata = self.get_first_tag(GBLTagId.METADATA)
@@ -194,35 +235,44 @@ class GBLImage(FirmwareImage):
 class EBLImage(FirmwareImage):
     @classmethod
     def from_bytes(cls, data: bytes) -> EBLImage:
+        from zigpy.ota.validators import parse_silabs_ebl
+
         tags = []
 
         for tag_bytes, value in parse_silabs_ebl(data):
-            tag, _ = EBLTagId.deserialize(tag_bytes)
+            tag_id = int.from_bytes(tag_bytes, "big")
+            tag = _EBL_TAGS_BY_VALUE.get(tag_id)
+
+            if tag is None:
+                tag = EBLTagId(tag_id)
+
             tags.append((tag, value))
 
         return cls(tags=tags)
 
     def serialize(self) -> bytes:
-        return pad_to_multiple(
-            b"".join(
-                [
-                    tag_id.serialize() + len(value).to_bytes(2, "big") + value
-                    for tag_id, value in self.tags
-                ]
-            ),
-            64,
-            b"\xff",
-        )
+        size = sum(_EBL_TAG_HEADER.size + len(value) for _, value in self.tags)
+        data = bytearray(b"\xff") * (size + -size % 64)
+        offset = 0
+
+        for tag_id, value in self.tags:
+            _EBL_TAG_HEADER.pack_into(data, offset, tag_id, len(value))
+            offset += _EBL_TAG_HEADER.size
+
+            data[offset : offset + len(value)] = value
+            offset += len(value)
+
+        return bytes(data)
 
     def get_nabucasa_metadata(self) -> NabuCasaMetadata:
         raise KeyError("Metadata not supported for EBL")
 
 
 def parse_firmware_image(data: bytes) -> FirmwareImage:
-    for fw_cls in [GBLImage, EBLImage]:
-        try:
-            return fw_cls.from_bytes(data)
-        except ValidationError:
-            pass
+    # Both formats must start with their header tag
+    if data[:4] == GBLTagId.HEADER.serialize():
+        return GBLImage.from_bytes(data)
+    elif data[:2] == EBLTagId.HEADER.serialize():
+        return EBLImage.from_bytes(data)
 
     raise ValueError("Unknown firmware image type")
@@ -8,13 +8,11 @@ import logging
 import os.path
 import pathlib
 import re
+import sys
 import typing
 import urllib.parse
 
-import bellows.types
 import click
-import coloredlogs
-import zigpy.ota.validators
 import zigpy.types
 
 from .common import CommaSeparatedNumbers, patch_pyserial_asyncio, put_first
@@ -24,7 +22,7 @@ from .const import (
     ApplicationType,
     ResetTarget,
 )
-from .firmware import FirmwareImageType, parse_firmware_image
+from .firmware import FirmwareImage, FirmwareImageType, parse_firmware_image
 from .flasher import Flasher
 from .xmodemcrc import BLOCK_SIZE as XMODEM_BLOCK_SIZE, ReceiverCancelled
 
@@ -33,6 +31,9 @@ patch_pyserial_asyncio()
 _LOGGER = logging.getLogger(__name__)
 LOG_LEVELS = ["INFO", "DEBUG"]
 
+# COM10 and above must use the `\\.\COMxx` syntax
+WINDOWS_COM_PORT_REGEX = re.compile(r"^COM[0-9]$|\\\\\.\\COM[0-9]+$")
+
 
 def click_coroutine(f: typing.Callable) -> typing.Callable:
     @functools.wraps(f)
@@ -81,8 +82,8 @@ class SerialPort(click.ParamType):
         if path.exists():
             return value
 
-        # Windows COM port (COM10+ uses a different syntax)
-        if re.match(r"^COM[0-9]$|\\\\\.\\COM[0-9]+$", str(path)):
+        # Windows COM port
+        if WINDOWS_COM_PORT_REGEX.match(str(path)):
             return value
 
         # Socket URI
@@ -156,15 +157,27 @@ def main(
     probe_method: list[ApplicationType],
     bootloader_reset: str | None,
 ) -> None:
-    coloredlogs.install(
-        fmt=(
-            "%(asctime)s.%(msecs)03d"
-            " %(hostname)s"
-            " %(name)s"
-            " %(levelname)s %(message)s"
-        ),
-        level=LOG_LEVELS[min(len(LOG_LEVELS) - 1, verbose)],
-    )
+    log_level = LOG_LEVELS[min(len(LOG_LEVELS) - 1, verbose)]
+
+    # Colors are only useful when a human is watching
+    if sys.stderr.isatty():
+        import coloredlogs
+
+        coloredlogs.install(
+            fmt=(
+                "%(asctime)s.%(msecs)03d"
+                " %(hostname)s"
+                " %(name)s"
+                " %(levelname)s %(message)s"
+            ),
+            level=log_level,
+        )
+    else:
+        logging.basicConfig(
+            format="%(asctime)s.%(msecs)03d %(name)s %(levelname)s %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+            level=log_level,
+        )
 
     # Override all application baudrates if a specific value is provided
     if ctx.get_parameter_source("baudrate") != click.core.ParameterSource.DEFAULT:
@@ -201,22 +214,30 @@ def main(
     }
 
 
-@main.command()
-@click.pass_context
-@click.option("--firmware", type=click.File("rb"), required=True, show_default=True)
-@click_coroutine
-async def dump_gbl_metadata(ctx: click.Context, firmware: typing.BinaryIO) -> None:
-    # Parse and validate the firmware image
+def _read_firmware_image(firmware: typing.BinaryIO) -> tuple[bytes, FirmwareImage]:
+    """Read, parse, and validate the firmware image passed on the command line."""
+    import zigpy.ota.validators
+
     firmware_data = firmware.read()
     firmware.close()
 
     try:
         fw_image = parse_firmware_image(firmware_data)
-    except zigpy.ota.validators.ValidationError as e:
+    except (zigpy.ota.validators.ValidationError, ValueError) as e:
         raise click.ClickException(
             f"{firmware.name!r} does not appear to be a valid firmware image: {e!r}"
         )
 
+    return firmware_data, fw_image
+
+
+@main.command()
+@click.pass_context
+@click.option("--firmware", type=click.File("rb"), required=True, show_default=True)
+@click_coroutine
+async def dump_gbl_metadata(ctx: click.Context, firmware: typing.BinaryIO) -> None:
+    _, fw_image = _read_firmware_image(firmware)
+
     try:
         metadata = fw_image.get_nabucasa_metadata()
     except KeyError:
@@ -252,6 +273,8 @@ async def probe(ctx: click.Context) -> None:
 @click.option("--ieee", required=True, type=zigpy.types.EUI64.convert)
 @click_coroutine
 async def write_ieee(ctx: click.Context, ieee: zigpy.types.EUI64) -> None:
+    import bellows.types
+
     new_eui64 = bellows.types.EmberEUI64(ieee)
 
     try:
@@ -282,16 +305,7 @@ async def flash(
 ) -> None:
     flasher = ctx.obj["flasher"]
 
-    # Parse and validate the firmware image
-    firmware_data = firmware.read()
-    firmware.close()
-
-    try:
-        fw_image = parse_firmware_image(firmware_data)
-    except (zigpy.ota.validators.ValidationError, ValueError) as e:
-        raise click.ClickException(
-            f"{firmware.name!r} does not appear to be a valid firmware image: {e!r}"
-        )
+    firmware_data, fw_image = _read_firmware_image(firmware)
 
     try:
         metadata = fw_image.get_nabucasa_metadata()
@@ -302,10 +316,13 @@ async def flash(
         _LOGGER.info("Extracted GBL metadata: %s", metadata)
 
     # Prefer to probe with the current firmware's settings to speed up startup after the
-    # firmware is flashed for the first time
+    # firmware is flashed for the first time. Not every image type can be probed.
     if metadata is not None and metadata.fw_type is not None:
-        app_type = FW_IMAGE_TYPE_TO_APPLICATION_TYPE[metadata.fw_type]
+        app_type = FW_IMAGE_TYPE_TO_APPLICATION_TYPE.get(metadata.fw_type)
+    else:
+        app_type = None
 
+    if app_type is not None:
         # Probe with the firmware's app type first
         if (
             ctx.parent.get_parameter_source("probe_method")
@@ -419,12 +436,23 @@ async def flash(
     if ctx.obj["verbosity"] > 1:
         pbar.is_hidden = True
 
+    # Redraw the progress bar at most ~200 times instead of after every block
+    update_interval = max(XMODEM_BLOCK_SIZE, len(firmware_data) // 200)
+    last_update = 0
+
+    def update_progress(current: int, total: int) -> None:
+        nonlocal last_update
+
+        if current - last_update >= update_interval or current == total:
+            pbar.update(current - last_update)
+            last_update = current
+
     with pbar:
         try:
             await flasher.flash_firmware(
                 fw_image,
                 run_firmware=True,
-                progress_callback=lambda current, _: pbar.update(XMODEM_BLOCK_SIZE),
+                progress_callback=update_progress,
             )
         except ReceiverCancelled:
             raise click.ClickException(
@@ -5,17 +5,12 @@ import dataclasses
 import logging
 import typing
 
-import async_timeout
-import bellows.config
-import bellows.ezsp
-import bellows.types
-
 from .common import (
     PROBE_TIMEOUT,
     SerialProtocol,
     Version,
+    asyncio_timeout,
     connect_protocol,
-    pad_to_multiple,
 )
 from .const import DEFAULT_BAUDRATES, GPIO_CONFIGS, ApplicationType, ResetTarget
 from .cpc import CPCProtocol
@@ -24,7 +19,9 @@ from .firmware import FirmwareImage
 from .gecko_bootloader import GeckoBootloaderProtocol, NoFirmwareError
 from .gpio import find_gpiochip_by_label, send_gpio_pattern
 from .spinel import SpinelProtocol
-from .xmodemcrc import BLOCK_SIZE as XMODEM_BLOCK_SIZE
+
+if typing.TYPE_CHECKING:
+    import bellows.types
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -251,13 +248,15 @@ class Flasher:
             pass
         elif self.app_type is ApplicationType.CPC:
             async with self._connect_cpc(self.app_baudrate) as cpc:
-                async with async_timeout.timeout(PROBE_TIMEOUT):
+                async with asyncio_timeout(PROBE_TIMEOUT):
                     await cpc.enter_bootloader()
         elif self.app_type is ApplicationType.SPINEL:
             async with self._connect_spinel(self.app_baudrate) as spinel:
-                async with async_timeout.timeout(PROBE_TIMEOUT):
+                async with asyncio_timeout(PROBE_TIMEOUT):
                     await spinel.enter_bootloader()
         elif self.app_type is ApplicationType.EZSP:
+            import bellows.types
+
             async with self._connect_ezsp(self.app_baudrate) as ezsp:
                 try:
                     res = await ezsp.launchStandaloneBootloader(mode=0x01)
@@ -286,11 +285,9 @@ class Flasher:
         run_firmware: bool = True,
         progress_callback: typing.Callable[[int, int], typing.Any] | None = None,
     ) -> None:
+        # The final XMODEM block is padded as it is sent
         data = firmware.serialize()
 
-        # Pad the image to the XMODEM block size
-        data = pad_to_multiple(data, XMODEM_BLOCK_SIZE, b"\xff")
-
         async with self._connect_gecko_bootloader(self.bootloader_baudrate) as gecko:
             await gecko.probe()
             await gecko.upload_firmware(data, progress_callback=progress_callback)
@@ -302,6 +299,8 @@ class Flasher:
         if self.app_type != ApplicationType.EZSP:
             raise RuntimeError(f"Device is not running EmberZNet: {self.app_type}")
 
+        import bellows.types
+
         async with self._connect_ezsp(self.app_baudrate) as ezsp:
             for config in bellows.types.EzspConfigId:
                 v = await ezsp.getConfigurationValue(configId=config)
@@ -310,6 +309,8 @@ class Flasher:
                 print(f"{config.name}={v[1]}")
 
     async def write_emberznet_eui64(self, new_eui64: bellows.types.EUI64) -> bool:
+        import bellows.types
+
         await self.probe_app_type()
 
         if self.app_type != ApplicationType.EZSP:
@@ -6,9 +6,13 @@ import logging
 import re
 import typing
 
-import async_timeout
-
-from .common import PROBE_TIMEOUT, SerialProtocol, StateMachine, Version
+from .common import (
+    PROBE_TIMEOUT,
+    SerialProtocol,
+    StateMachine,
+    Version,
+    asyncio_timeout,
+)
 from .xmodemcrc import send_xmodem128_crc
 
 _LOGGER = logging.getLogger(__name__)
@@ -67,7 +71,7 @@ class GeckoBootloaderProtocol(SerialProtocol):
 
     async def probe(self) -> Version:
         """Attempt to communicate with the bootloader."""
-        async with async_timeout.timeout(PROBE_TIMEOUT):
+        async with asyncio_timeout(PROBE_TIMEOUT):
             return await self.ebl_info()
 
     async def ebl_info(self) -> Version:
@@ -75,8 +79,7 @@ class GeckoBootloaderProtocol(SerialProtocol):
         self._state_machine.state = State.WAITING_FOR_MENU
 
         # Ember bootloader requires a newline
-        self.send_data(b"\n")
-        self.send_data(GeckoBootloaderOption.EBL_INFO)
+        self.send_data(b"\n" + GeckoBootloaderOption.EBL_INFO)
 
         await self._state_machine.wait_for_state(State.IN_MENU)
 
@@ -92,7 +95,7 @@ class GeckoBootloaderProtocol(SerialProtocol):
         self.send_data(GeckoBootloaderOption.RUN_FIRMWARE)
 
         try:
-            async with async_timeout.timeout(RUN_APPLICATION_DELAY):
+            async with asyncio_timeout(RUN_APPLICATION_DELAY):
                 await self._state_machine.wait_for_state(State.IN_MENU)
         except asyncio.TimeoutError:
             # The menu did not appear so the application must be running
@@ -126,6 +129,7 @@ class GeckoBootloaderProtocol(SerialProtocol):
             transport=self._transport,
             max_failures=max_failures,
             progress_callback=progress_callback,
+            padding=b"\xff",
         )
 
         await self._state_machine.wait_for_state(State.UPLOAD_DONE)
@@ -133,7 +137,7 @@ class GeckoBootloaderProtocol(SerialProtocol):
 
         # The menu is sometimes sent immediately after upload
         try:
-            async with async_timeout.timeout(MENU_AFTER_UPLOAD_TIMEOUT):
+            async with asyncio_timeout(MENU_AFTER_UPLOAD_TIMEOUT):
                 await self._state_machine.wait_for_state(State.IN_MENU)
         except asyncio.TimeoutError:
             # If not, trigger it manually
@@ -24,7 +24,8 @@ elif is_gpiod_v1:
     def _send_gpio_pattern(
         chip: str, pin_states: dict[int, list[bool]], toggle_delay: float
     ) -> None:
-        num_states = len(next(iter(pin_states.values())))
+        # The state of every pin at each step
+        steps = [[int(state) for state in step] for step in zip(*pin_states.values())]
 
         chip = gpiod.chip(chip, gpiod.chip.OPEN_BY_PATH)
         lines = chip.get_lines(pin_states.keys())
@@ -35,12 +36,12 @@ elif is_gpiod_v1:
 
         try:
             # Open the pins and set their initial states
-            lines.request(config, [int(states[0]) for states in pin_states.values()])
+            lines.request(config, steps[0])
 
             # Send all subsequent states
-            for i in range(1, num_states):
+            for step in steps[1:]:
                 time.sleep(toggle_delay)
-                lines.set_values([int(states[i]) for states in pin_states.values()])
+                lines.set_values(step)
         finally:
             # Clean up and ensure the GPIO pins are reset to inputs
             lines.set_direction_input()
@@ -52,7 +53,13 @@ else:
         chip: str, pin_states: dict[int, list[bool]], toggle_delay: float
     ) -> None:
         # `gpiod` isn't available on Windows
-        num_states = len(next(iter(pin_states.values())))
+        pins = list(pin_states.keys())
+
+        # The state of every pin at each step
+        steps = [
+            [gpiod.line.Value(int(state)) for state in step]
+            for step in zip(*pin_states.values())
+        ]
 
         with gpiod.request_lines(
             path=chip,
@@ -61,27 +68,22 @@ else:
                 # Set initial states
                 pin: gpiod.LineSettings(
                     direction=gpiod.line.Direction.OUTPUT,
-                    output_value=gpiod.line.Value(states[0]),
+                    output_value=value,
                 )
-                for pin, states in pin_states.items()
+                for pin, value in zip(pins, steps[0])
             },
         ) as request:
             try:
                 # Send all subsequent states
-                for i in range(1, num_states):
+                for step in steps[1:]:
                     time.sleep(toggle_delay)
-                    request.set_values(
-                        {
-                            pin: gpiod.line.Value(int(pin_states[pin][i]))
-                            for pin, states in pin_states.items()
-                        }
-                    )
+                    request.set_values(dict(zip(pins, step)))
             finally:
                 # Clean up and ensure the GPIO pins are reset to inputs
                 request.reconfigure_lines(
                     {
                         pin: gpiod.LineSettings(direction=gpiod.line.Direction.INPUT)
-                        for pin, states in pin_states.items()
+                        for pin in pins
                     }
                 )
 
@@ -3,66 +3,60 @@ from __future__ import annotations
 import asyncio
 import dataclasses
 import logging
+import re
 import typing
 
-import async_timeout
 import zigpy.types
 
-from .common import SerialProtocol, Version, crc16_kermit
+from .common import SerialProtocol, Version, asyncio_timeout, crc16_kermit
 from .spinel_types import CommandID, HDLCSpecial, PropertyID, ResetReason
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# The escape byte must be escaped first, every other replacement introduces one
+HDLC_ESCAPED_BYTES = [
+    HDLCSpecial.ESCAPE,
+    HDLCSpecial.FLAG,
+    HDLCSpecial.XON,
+    HDLCSpecial.XOFF,
+    HDLCSpecial.VENDOR,
+]
+
+# Matches an escape byte along with the byte it escapes, or a flag byte
+HDLC_UNESCAPE_REGEX = re.compile(rb"\x7D(.?)|\x7E", flags=re.DOTALL)
+
+
+def _hdlc_unescape(match: re.Match) -> bytes:
+    # Flag bytes and a trailing escape byte are dropped
+    if not match.group(1):
+        return b""
+
+    byte = match.group(1)[0] ^ 0x20
+
+    if byte not in HDLC_ESCAPED_BYTES:
+        raise ValueError(f"Invalid unescaped byte: 0x{byte:02X}")
+
+    return bytes([byte])
+
+
 @dataclasses.dataclass(frozen=True)
 class HDLCLiteFrame:
     data: bytes
 
     def serialize(self) -> bytes:
-        payload = self.data + crc16_kermit(self.data).to_bytes(2, "little")
-        encoded = bytearray()
+        encoded = self.data + crc16_kermit(self.data).to_bytes(2, "little")
 
-        for byte in payload:
-            if byte in (
-                HDLCSpecial.FLAG,
-                HDLCSpecial.ESCAPE,
-                HDLCSpecial.XON,
-                HDLCSpecial.XOFF,
-                HDLCSpecial.VENDOR,
-            ):
-                encoded.append(HDLCSpecial.ESCAPE)
-                byte ^= 0x20
+        for byte in HDLC_ESCAPED_BYTES:
+            encoded = encoded.replace(
+                bytes([byte]), bytes([HDLCSpecial.ESCAPE, byte ^ 0x20])
+            )
 
-            encoded.append(byte)
-
-        return bytes([HDLCSpecial.FLAG]) + bytes(encoded) + bytes([HDLCSpecial.FLAG])
+        return bytes([HDLCSpecial.FLAG]) + encoded + bytes([HDLCSpecial.FLAG])
 
     @classmethod
     def from_bytes(cls, data: bytes) -> HDLCLiteFrame:
-        unescaped = bytearray()
-        unescaping = False
-
-        for byte in data:
-            if unescaping:
-                byte ^= 0x20
-
-                if byte not in (
-                    HDLCSpecial.FLAG,
-                    HDLCSpecial.ESCAPE,
-                    HDLCSpecial.XON,
-                    HDLCSpecial.XOFF,
-                    HDLCSpecial.VENDOR,
-                ):
-                    raise ValueError(f"Invalid unescaped byte: 0x{byte:02X}")
-
-                unescaping = False
-            elif byte == HDLCSpecial.ESCAPE:
-                unescaping = True
-                continue
-            elif byte == HDLCSpecial.FLAG:
-                continue
-
-            unescaped.append(byte)
+        unescaped = HDLC_UNESCAPE_REGEX.sub(_hdlc_unescape, data)
 
         data = unescaped[:-2]
         crc = unescaped[-2:]
@@ -112,14 +106,18 @@ class SpinelProtocol(SerialProtocol):
     def data_received(self, data: bytes) -> None:
         super().data_received(data)
 
-        self._buffer = self._buffer.lstrip(bytes([HDLCSpecial.FLAG]))
+        flag = bytes([HDLCSpecial.FLAG])
 
-        if bytes([HDLCSpecial.FLAG]) not in self._buffer:
-            return
-
-        while self._buffer:
+        while True:
             # Flag bytes can come before and after any packet, any number of times
-            chunk, _, self._buffer = self._buffer.partition(bytes([HDLCSpecial.FLAG]))
+            end = self._buffer.find(flag)
+
+            if end == -1:
+                break
+
+            # Consume the buffer in place, leaving any incomplete frame behind
+            chunk = bytes(self._buffer[:end])
+            del self._buffer[: end + 1]
 
             if not chunk:
                 continue
@@ -191,18 +189,20 @@ class SpinelProtocol(SerialProtocol):
             frame, header=frame.header.replace(transaction_id=tid)
         )
 
+        data = HDLCLiteFrame(data=new_frame.serialize()).serialize()
+
         if not wait_response:
             _LOGGER.debug("Sending frame %r", new_frame)
-            self.send_data(HDLCLiteFrame(data=new_frame.serialize()).serialize())
+            self.send_data(data)
             return None
 
         try:
             for attempt in range(retries + 1):
                 _LOGGER.debug("Sending frame %r", new_frame)
-                self.send_data(HDLCLiteFrame(data=new_frame.serialize()).serialize())
+                self.send_data(data)
 
                 try:
-                    async with async_timeout.timeout(timeout):
+                    async with asyncio_timeout(timeout):
                         return await asyncio.shield(future)
                 except asyncio.TimeoutError:
                     _LOGGER.debug(
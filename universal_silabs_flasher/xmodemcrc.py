@@ -5,10 +5,9 @@ import dataclasses
 import logging
 import typing
 
-import async_timeout
 import zigpy.types
 
-from .common import crc16_ccitt
+from .common import asyncio_timeout, crc16_ccitt
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,15 +33,17 @@ class XmodemCRCPacket:
     """XModem CRC packet implementing the zigpy `serialize` API."""
 
     number: zigpy.types.uint8_t
-    payload: bytes
+    payload: bytes | memoryview
 
     def serialize(self) -> bytes:
         """Serialize the packet, computing header and payload checksums."""
         assert len(self.payload) == BLOCK_SIZE
-        return (
-            bytes([PacketType.SOH, self.number, 0xFF - self.number])
-            + self.payload
-            + crc16_ccitt(self.payload).to_bytes(2, "big")
+        return b"".join(
+            [
+                bytes([PacketType.SOH, self.number, 0xFF - self.number]),
+                self.payload,
+                crc16_ccitt(self.payload).to_bytes(2, "big"),
+            ]
         )
 
 
@@ -66,7 +67,7 @@ async def send_xmodem128_crc_data(
         await writer.drain()
 
         # And wait for a response
-        async with async_timeout.timeout(RECEIVE_TIMEOUT):
+        async with asyncio_timeout(RECEIVE_TIMEOUT):
             rsp_byte = await reader.readexactly(1)
 
         _LOGGER.debug("Got response: %r", rsp_byte)
@@ -90,10 +91,15 @@ async def send_xmodem128_crc(
     transport: asyncio.Transport,
     max_failures: int = 3,
     progress_callback: typing.Callable[[int, int], typing.Any] | None = None,
+    padding: bytes | None = None,
 ) -> None:
-    """Send `data` over `transport` using XModemCRC with a 128 byte block size."""
+    """Send `data` over `transport` using XModemCRC with a 128 byte block size.
 
-    if len(data) % BLOCK_SIZE != 0:
+    If `padding` is provided, a partial final block is padded with it. Otherwise, the
+    length of `data` must be a multiple of the block size.
+    """
+
+    if padding is None and len(data) % BLOCK_SIZE != 0:
         raise ValueError(f"Data length must be divisible by {BLOCK_SIZE}: {len(data)}")
 
     loop = asyncio.get_running_loop()
@@ -117,10 +123,22 @@ async def send_xmodem128_crc(
         # FIXME: ensure any subsequent "C"s have been cleared so they do not interfere
         reader._buffer.clear()
 
-        for index in range(0, len(data) // BLOCK_SIZE):
+        # Blocks are sliced out of a view to avoid copying each one before sending
+        view = memoryview(data)
+
+        for index in range(0, -(-len(data) // BLOCK_SIZE)):
+            payload: bytes | memoryview = view[
+                BLOCK_SIZE * index : BLOCK_SIZE * (index + 1)
+            ]
+
+            # Only the final block can be partial, the rest of the data is not copied
+            if len(payload) < BLOCK_SIZE:
+                assert padding is not None
+                payload = payload.tobytes().ljust(BLOCK_SIZE, padding)
+
             packet = XmodemCRCPacket(
                 number=(index + 1) & 0xFF,  # `seq` starts at 1 and then wraps
-                payload=data[BLOCK_SIZE * index : BLOCK_SIZE * (index + 1)],
+                payload=payload,
             )
 
             # Send the packet
@@ -131,7 +149,7 @@ async def send_xmodem128_crc(
                 max_failures=max_failures,
             )
 
-            offset = (index + 1) * BLOCK_SIZE
+            offset = min((index + 1) * BLOCK_SIZE, len(data))
 
             if progress_callback is not None:
                 progress_callback(offset, len(data))